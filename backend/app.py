@@ -108,6 +108,8 @@ def preprocess_input_data(input_df):
     1. Handle missing values
     2. Handle outliers
     3. Encode categorical features
+
+    Returns the processed data, the fitted label encoders and the IQR clip bounds per numeric column
     """
     # Store original column names and data for reference
     original_columns = input_df.columns.tolist()
@@ -130,12 +132,14 @@ def preprocess_input_data(input_df):
 
     # 2. Handle Outliers (using IQR method):
     numerical_cols = input_df.select_dtypes(include=np.number).columns.tolist()
+    clip_bounds = {}
     for col in numerical_cols:
         Q1 = input_df[col].quantile(0.25)
         Q3 = input_df[col].quantile(0.75)
         IQR = Q3 - Q1
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
+        clip_bounds[col] = (float(lower_bound), float(upper_bound))
         input_df[col] = np.where(input_df[col] < lower_bound, lower_bound, input_df[col])
         input_df[col] = np.where(input_df[col] > upper_bound, upper_bound, input_df[col])
 
@@ -151,7 +155,7 @@ def preprocess_input_data(input_df):
 
     print("Categorical features label encoded.")
 
-    return input_df, label_encoders
+    return input_df, label_encoders, clip_bounds
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -282,6 +286,122 @@ def generate_lime_explanations(model, processed_data, original_data, feature_nam
         print(f"Error in generate_lime_explanations: {str(e)}")
         return {}
 
+def build_whatif_grid(processed_df, feature, grid_size, categorical=False):
+    """
+    Build the grid of values to sweep for a feature (in preprocessed space).
+    Low-cardinality features use every observed value, others use quantiles.
+    Categorical codes are never interpolated: their quantiles snap to observed codes.
+    """
+    column_values = processed_df[feature].to_numpy(dtype=float)
+    unique_values = np.unique(column_values)
+    if len(unique_values) <= grid_size:
+        return unique_values
+    method = 'nearest' if categorical else 'linear'
+    return np.unique(np.quantile(column_values, np.linspace(0, 1, grid_size), method=method))
+
+def format_grid_labels(feature, grid, label_encoders):
+    """
+    Map grid values back to display values (original category names for encoded features)
+    """
+    if feature in label_encoders:
+        return [str(label) for label in label_encoders[feature].inverse_transform(grid.astype(int))]
+    return [convert_to_serializable(value) for value in grid]
+
+def get_whatif_grid(feature, grid_size):
+    """
+    Get the sweep grid for a feature, cached per dataset
+    """
+    cache = current_dataset['whatif_cache']
+    key = ('grid', feature, grid_size)
+    if key not in cache:
+        label_encoders = current_dataset['label_encoders']
+        grid = build_whatif_grid(current_dataset['processed_df'], feature, grid_size, categorical=feature in label_encoders)
+        cache[key] = {
+            'grid': grid,
+            'labels': format_grid_labels(feature, grid, label_encoders)
+        }
+    return cache[key]
+
+def compute_partial_dependence(model, processed_df, feature_index, grid, sample_size=200):
+    """
+    Compute partial dependence and ICE band for a feature in a single vectorized batch.
+    Every sampled row is repeated once per grid value and scored with one predict_proba call.
+    """
+    sample = processed_df.sample(n=min(sample_size, len(processed_df)), random_state=42).to_numpy(dtype=float)
+    batch = np.repeat(sample[np.newaxis, :, :], len(grid), axis=0)
+    batch[:, :, feature_index] = grid[:, np.newaxis]
+
+    probabilities = model.predict_proba(batch.reshape(-1, sample.shape[1]))[:, 1] * 100
+    ice = probabilities.reshape(len(grid), len(sample))
+
+    return {
+        'partial_dependence': ice.mean(axis=1).round(2),
+        'ice_lower': np.percentile(ice, 10, axis=1).round(2),
+        'ice_upper': np.percentile(ice, 90, axis=1).round(2)
+    }
+
+def get_partial_dependence(feature, grid_size):
+    """
+    Get partial dependence / ICE table for a feature, cached per dataset
+    """
+    cache = current_dataset['whatif_cache']
+    key = ('pdp', feature, grid_size)
+    if key not in cache:
+        cache[key] = compute_partial_dependence(
+            current_dataset['model'],
+            current_dataset['processed_df'],
+            current_dataset['feature_names'].index(feature),
+            get_whatif_grid(feature, grid_size)['grid']
+        )
+    return cache[key]
+
+def parse_integer_param(value):
+    """
+    Parse a JSON request parameter that must be an integer (an int or a digit string).
+    Returns None for booleans, floats and anything else.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        try:
+            return int(value.strip())
+        except (TypeError, ValueError, OverflowError):
+            return None
+    return None
+
+def decode_override_value(feature, encoded_value, label_encoders):
+    """
+    Map an encoded override back to the value that was actually scored (category name or clipped number)
+    """
+    if feature in label_encoders:
+        return str(label_encoders[feature].inverse_transform([int(encoded_value)])[0])
+    return encoded_value
+
+def encode_override_value(feature, value, label_encoders, clip_bounds):
+    """
+    Convert a user-supplied override into preprocessed space, the same way /api/predict does:
+    label-encode categorical values and clip numeric values to the upload's IQR bounds
+    """
+    if value is None:
+        raise ValueError(f"Override value for feature '{feature}' must not be null")
+    if feature in label_encoders:
+        encoder = label_encoders[feature]
+        if str(value) not in encoder.classes_:
+            raise ValueError(f"Unknown value '{value}' for feature '{feature}'. Expected one of: {', '.join(encoder.classes_)}")
+        return float(encoder.transform([str(value)])[0])
+    try:
+        numeric_value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Override value for feature '{feature}' must be numeric, got '{value}'")
+    if not np.isfinite(numeric_value):
+        raise ValueError(f"Override value for feature '{feature}' must be a finite number")
+    if feature in clip_bounds:
+        lower_bound, upper_bound = clip_bounds[feature]
+        numeric_value = min(max(numeric_value, lower_bound), upper_bound)
+    return numeric_value
+
 @app.route('/api/predict', methods=['POST'])
 def predict_churn():
     """
@@ -329,7 +449,7 @@ def predict_churn():
         original_df = input_df[original_input_columns].copy()
         
         # 2. Preprocess the data
-        processed_df, label_encoders = preprocess_input_data(input_df)
+        processed_df, label_encoders, clip_bounds = preprocess_input_data(input_df)
         print("Data preprocessing completed")
         
         # 3. Load the trained model
@@ -394,7 +514,10 @@ def predict_churn():
             'columns': formatted_columns,
             'customers': customers_data,
             'model': model,
-            'feature_names': processed_df.columns.tolist()
+            'feature_names': processed_df.columns.tolist(),
+            'label_encoders': label_encoders,
+            'clip_bounds': clip_bounds,
+            'whatif_cache': {}  # Per-dataset grids and partial dependence tables
         }
         current_explanations = {}  # Will be populated on-demand
         
@@ -539,6 +662,145 @@ def explain_customer(customer_index):
             'error': f'An error occurred: {str(e)}'
         }), 500
 
+@app.route('/api/whatif', methods=['POST'])
+def whatif_analysis():
+    """
+    API endpoint for interactive what-if analysis on a stored customer.
+    Applies optional attribute overrides, then sweeps each requested feature over a grid
+    and scores all perturbations in one vectorized predict_proba call against the loaded model.
+    """
+    global current_dataset
+
+    try:
+        # Check if we have data loaded
+        if current_dataset is None:
+            return jsonify({
+                'success': False,
+                'error': 'No dataset loaded. Please upload data first.'
+            }), 400
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or 'customer_index' not in data:
+            return jsonify({'success': False, 'error': 'No customer_index provided'}), 400
+
+        # Validate request parameters
+        customer_index = parse_integer_param(data['customer_index'])
+        if customer_index is None:
+            return jsonify({'success': False, 'error': 'customer_index must be an integer'}), 400
+
+        grid_size = parse_integer_param(data.get('grid_size', 10))
+        if grid_size is None:
+            return jsonify({'success': False, 'error': 'grid_size must be an integer'}), 400
+
+        include_partial_dependence = data.get('include_partial_dependence', False)
+        if not isinstance(include_partial_dependence, bool):
+            return jsonify({'success': False, 'error': 'include_partial_dependence must be true or false'}), 400
+
+        features = data.get('features')
+        if isinstance(features, str):
+            features = [features]
+        if features is not None and (not isinstance(features, list) or not all(isinstance(f, str) for f in features)):
+            return jsonify({'success': False, 'error': 'features must be a list of feature names'}), 400
+
+        overrides = data.get('overrides')
+        if overrides is not None and not isinstance(overrides, dict):
+            return jsonify({'success': False, 'error': 'overrides must be an object mapping feature names to values'}), 400
+
+        # Validate customer index
+        if customer_index < 0 or customer_index >= len(current_dataset['customers']):
+            return jsonify({
+                'success': False,
+                'error': f'Invalid customer index. Must be between 0 and {len(current_dataset["customers"]) - 1}'
+            }), 400
+
+        feature_names = current_dataset['feature_names']
+        label_encoders = current_dataset['label_encoders']
+        clip_bounds = current_dataset['clip_bounds']
+        features = feature_names if features is None else list(dict.fromkeys(features))
+        overrides = overrides or {}
+        grid_size = min(max(grid_size, 2), 50)
+
+        unknown_features = [f for f in list(features) + list(overrides) if f not in feature_names]
+        if unknown_features:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown features: {", ".join(unknown_features)}'
+            }), 400
+
+        start_time = time.time()
+        model = current_dataset['model']
+
+        # 1. Build the (possibly tweaked) customer row in preprocessed space
+        customer_row = current_dataset['processed_df'].iloc[customer_index].to_numpy(dtype=float)
+        applied_overrides = {}
+        try:
+            for feature, value in overrides.items():
+                encoded_value = encode_override_value(feature, value, label_encoders, clip_bounds)
+                customer_row[feature_names.index(feature)] = encoded_value
+                applied_overrides[feature] = decode_override_value(feature, encoded_value, label_encoders)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        # 2. Stack the baseline row and every feature perturbation into one batch
+        grids = [get_whatif_grid(feature, grid_size) for feature in features]
+        batch = np.tile(customer_row, (1 + sum(len(g['grid']) for g in grids), 1))
+        offset = 1
+        for feature, grid in zip(features, grids):
+            batch[offset:offset + len(grid['grid']), feature_names.index(feature)] = grid['grid']
+            offset += len(grid['grid'])
+
+        # 3. Score everything in a single call
+        probabilities = (model.predict_proba(batch)[:, 1] * 100).round(2)
+        baseline_probability = probabilities[0]
+
+        # 4. Split the batch back into per-feature sensitivity curves
+        curves = []
+        offset = 1
+        for feature, grid in zip(features, grids):
+            curve_probabilities = probabilities[offset:offset + len(grid['grid'])]
+            offset += len(grid['grid'])
+            curve = {
+                'feature': feature,
+                'label': feature.replace('_', ' ').title(),
+                'categorical': feature in label_encoders,
+                'values': grid['labels'],
+                'churn_probabilities': convert_to_serializable(curve_probabilities),
+                'sensitivity': round(float(curve_probabilities.max() - curve_probabilities.min()), 2)
+            }
+            if include_partial_dependence:
+                curve.update(convert_to_serializable(get_partial_dependence(feature, grid_size)))
+            curves.append(curve)
+
+        # Most influential features first
+        curves.sort(key=lambda c: c['sensitivity'], reverse=True)
+
+        whatif_time = time.time() - start_time
+        print(f"What-if analysis for customer {customer_index}: {len(batch)} rows scored in {whatif_time:.3f} seconds")
+
+        return jsonify({
+            'success': True,
+            'customer_index': customer_index,
+            'baseline_churn_probability': convert_to_serializable(baseline_probability),
+            'original_churn_probability': current_dataset['customers'][customer_index]['Churn_Probability'],
+            'overrides': convert_to_serializable(overrides),
+            'applied_overrides': convert_to_serializable(applied_overrides),
+            'clipped_overrides': [
+                feature for feature in applied_overrides
+                if feature not in label_encoders and applied_overrides[feature] != float(overrides[feature])
+            ],
+            'curves': curves,
+            'processing_time': round(whatif_time, 3)
+        }), 200
+
+    except Exception as e:
+        print(f"Error in what-if analysis: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }), 500
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """